@@ -0,0 +1,35 @@
+from fastapi import HTTPException, Query, Response, status
+
+MAX_BATCH_IDS = 500
+MISSING_IDS_HEADER = 'X-Missing-Ids'
+
+
+def requested_ids(
+        ids: str | None = Query(
+            None,
+            pattern=r'^\s*\d+\s*(,\s*\d+\s*)*$',
+            description=f"Comma-separated ids to fetch, at most {MAX_BATCH_IDS}"
+        )
+) -> list[int] | None:
+    """Ids asked for with ``?ids=``, in order and without repeats."""
+    if ids is None:
+        return None
+    parsed = list(dict.fromkeys(int(value) for value in ids.split(',')))
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_BATCH_IDS} ids can be fetched at once"
+        )
+    return parsed
+
+
+def batch_result(
+        ids: list[int],
+        found: dict[int, dict],
+        response: Response
+) -> list[dict]:
+    """Found rows in the requested order; missing ids go to a header."""
+    missing = [str(item_id) for item_id in ids if item_id not in found]
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ','.join(missing)
+    return [found[item_id] for item_id in ids if item_id in found]
@@ -0,0 +1,66 @@
+"""Compare fetching movies one id at a time with one batch-by-ids call.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch_get --movies 100000 --ids 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.movie_service import MovieService
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=100_000)
+    parser.add_argument('--actors-per-movie', type=int, default=5)
+    parser.add_argument('--ids', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=5000,
+            actors_per_movie=args.actors_per_movie,
+            description_length=200
+        )
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+            rng = random.Random(0)
+            one_by_one, batched = [], []
+            for _ in range(args.repeat):
+                ids = rng.sample(range(1, args.movies + 1), args.ids)
+
+                started = time.perf_counter()
+                singles = [await service.get_movie(movie_id) for movie_id in ids]
+                one_by_one.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                batch = await service.get_movies_by_ids(ids)
+                batched.append(time.perf_counter() - started)
+
+                assert list(batch.values()) == singles
+
+    print(
+        f"{args.ids} ids: one by one p50="
+        f"{statistics.median(one_by_one) * 1000:.1f} ms, "
+        f"batch p50={statistics.median(batched) * 1000:.1f} ms"
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Compare applying mutations one request at a time with one batch.
+
+A sync job sends its creates, updates and deletes one after the other, so
+each waits for its own commit; the batch applies them all in one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch_ops --operations 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import aiosqlite
+from pydantic import TypeAdapter
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from schemas import BatchOperation
+from services.batch_service import BatchService
+
+
+def sync_job(rng: random.Random, operations: int, movies: int, actors: int) -> list:
+    """Mixed mutations as a sync job would send them."""
+    adapter = TypeAdapter(list[BatchOperation])
+    kinds = ('create_actor', 'create_movie', 'patch_movie', 'update_actor')
+    job = []
+    for number in range(operations):
+        kind = rng.choice(kinds)
+        if kind == 'create_actor':
+            job.append({'op': kind, 'data': {'name': 'Synced', 'surname': 'Actor'}})
+        elif kind == 'create_movie':
+            job.append({'op': kind, 'data': {
+                'title': f'Synced movie {number}',
+                'director': 'Sync Job',
+                'year': 2000,
+                'actors': rng.sample(range(1, actors + 1), 3)
+            }})
+        elif kind == 'patch_movie':
+            job.append({'op': kind, 'id': rng.randint(1, movies),
+                        'data': {'year': rng.randint(1950, 2020)}})
+        else:
+            job.append({'op': kind, 'id': rng.randint(1, actors),
+                        'data': {'name': 'Renamed', 'surname': 'Actor'}})
+    return adapter.validate_python(job)
+
+
+async def run(path: str, job: list, batched: bool) -> float:
+    async with aiosqlite.connect(path) as connection:
+        connection.row_factory = aiosqlite.Row
+        await connection.execute('PRAGMA foreign_keys = ON')
+        async with connection.execute('PRAGMA journal_mode = WAL') as cursor:
+            await cursor.fetchone()
+        service = BatchService(connection, WriteCoordinator(asyncio.Lock()))
+
+        started = time.perf_counter()
+        if batched:
+            await service.run(job, atomic=True)
+        else:
+            for operation in job:
+                await service.run([operation], atomic=True)
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=10_000)
+    parser.add_argument('--actors', type=int, default=2000)
+    parser.add_argument('--operations', type=int, default=500)
+    args = parser.parse_args()
+
+    job = sync_job(random.Random(0), args.operations, args.movies, args.actors)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, batched in (('one by one', False), ('batch', True)):
+            path = os.path.join(directory, f'{name}.db')
+            create_catalog(
+                path,
+                movies=args.movies,
+                actors=args.actors,
+                actors_per_movie=5,
+                description_length=200
+            )
+            elapsed = await run(path, job, batched)
+            print(
+                f"{name:<11} operations={args.operations} "
+                f"elapsed={elapsed * 1000:8.1f} ms  "
+                f"throughput={args.operations / elapsed:8.0f}/s"
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""Measure bulk import throughput in rows per second.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bulk_import --actors 1000000 --movies 1000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from scripts.bulk_import import read_chunks
+from services.actor_service import ActorService
+from services.bulk_import_service import (
+    BULK_BATCH_SIZE,
+    CSV_FORMAT,
+    NDJSON_FORMAT,
+    BulkImportService
+)
+
+
+def _letters(number: int) -> str:
+    # Actor names may not contain digits.
+    name = ''
+    while True:
+        number, rest = divmod(number, 26)
+        name = string.ascii_lowercase[rest] + name
+        if number == 0:
+            return name.capitalize()
+
+
+def write_actors(path: Path, count: int, file_format: str) -> None:
+    with path.open('w', encoding='utf-8') as file:
+        if file_format == CSV_FORMAT:
+            file.write('name,surname\n')
+        for i in range(count):
+            name, surname = _letters(i), _letters(count - i)
+            if file_format == CSV_FORMAT:
+                file.write(f'{name},{surname}\n')
+            else:
+                file.write(json.dumps({'name': name, 'surname': surname}) + '\n')
+
+
+def write_movies(
+        path: Path,
+        count: int,
+        actors: int,
+        actors_per_movie: int,
+        seed: int = 0
+) -> None:
+    rng = random.Random(seed)
+    with path.open('w', encoding='utf-8') as file:
+        for i in range(count):
+            file.write(json.dumps({
+                'title': f'Movie {i}',
+                'director': f'Director {i % 500}',
+                'year': rng.randint(1920, 2025),
+                'description': 'x' * 200,
+                'actors': rng.sample(range(1, actors + 1), actors_per_movie),
+            }) + '\n')
+
+
+async def measure(name: str, rows: int, run) -> None:
+    started = time.perf_counter()
+    report = await run()
+    elapsed = time.perf_counter() - started
+    imported = report['imported'] if isinstance(report, dict) else rows
+    print(
+        f"{name:<22} rows={imported:<9} "
+        f"elapsed={elapsed:8.2f} s  "
+        f"throughput={imported / elapsed:10.0f} rows/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--actors', type=int, default=1_000_000)
+    parser.add_argument('--movies', type=int, default=1_000_000)
+    parser.add_argument('--actors-per-movie', type=int, default=3)
+    parser.add_argument('--per-row-sample', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        database = os.path.join(directory, 'bench.db')
+        create_catalog(database, movies=0, actors=0, actors_per_movie=0)
+
+        actors_csv = directory / 'actors.csv'
+        movies_ndjson = directory / 'movies.ndjson'
+        write_actors(actors_csv, args.actors, CSV_FORMAT)
+        write_movies(movies_ndjson, args.movies, args.actors, args.actors_per_movie)
+
+        async with aiosqlite.connect(database) as connection:
+            connection.row_factory = aiosqlite.Row
+            await connection.execute("PRAGMA foreign_keys = ON")
+            async with connection.execute("PRAGMA journal_mode = WAL") as cursor:
+                await cursor.fetchone()
+            writer = WriteCoordinator(asyncio.Lock(), window=0)
+            bulk = BulkImportService(connection, writer, batch_size=args.batch_size)
+
+            # The row-per-request baseline is only sampled, a million
+            # single-row transactions would take a long time.
+            actor_service = ActorService(connection, writer)
+
+            async def per_row():
+                for i in range(args.per_row_sample):
+                    await actor_service.add_actor(_letters(i), 'Sample')
+
+            await measure('actors per-row POST', args.per_row_sample, per_row)
+            await measure(
+                'actors bulk (csv)',
+                args.actors,
+                lambda: bulk.import_actors(read_chunks(actors_csv), CSV_FORMAT)
+            )
+            await measure(
+                'movies bulk (ndjson)',
+                args.movies,
+                lambda: bulk.import_movies(read_chunks(movies_ndjson), NDJSON_FORMAT)
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
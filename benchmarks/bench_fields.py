@@ -0,0 +1,68 @@
+"""Compare full movie pages with sparse ?fields= pages.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fields --movies 20000 --actors-per-movie 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.movie_service import MovieService
+
+SELECTIONS = {
+    'all fields': None,
+    'id,title,year,actors': ('id', 'title', 'year', 'actors'),
+    'id,title,year': ('id', 'title', 'year'),
+}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=20_000)
+    parser.add_argument('--actors-per-movie', type=int, default=10)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=1000,
+            actors_per_movie=args.actors_per_movie
+        )
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+            for name, names in SELECTIONS.items():
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    movies = await service.get_movies(limit=args.limit, fields=names)
+                    timings.append(time.perf_counter() - started)
+
+                if names is not None:
+                    movies = [
+                        {name: movie[name] for name in names} for movie in movies
+                    ]
+                payload = json.dumps(movies)
+                print(
+                    f"{name:<22} page of {args.limit}: "
+                    f"query p50={statistics.median(timings) * 1000:7.2f} ms  "
+                    f"payload={len(payload) / 1024:8.1f} KiB"
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
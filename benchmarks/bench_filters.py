@@ -0,0 +1,104 @@
+"""Time filtered and sorted movie listings as the catalog grows.
+
+Each query fetches one page through MovieService.get_movies, first with the
+filter indexes and then with them dropped. Run from the repository root:
+
+    python -m benchmarks.bench_filters --sizes 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.movie_service import MovieFilters, MovieService
+
+FILTER_INDEXES = ('idx_movie_year', 'idx_movie_title', 'idx_movie_director_year')
+
+
+def sample_filters(movies: int, actors: int, count: int) -> dict[str, list]:
+    rng = random.Random(0)
+    decades = [rng.randrange(1920, 2020, 10) for _ in range(count)]
+    return {
+        'director + decade, by year': [
+            MovieFilters(
+                year_from=decade,
+                year_to=decade + 9,
+                director=f"Director {rng.randrange(500)}",
+                sort='year'
+            )
+            for decade in decades
+        ],
+        'actor, by -year': [
+            MovieFilters(actor_id=rng.randint(1, actors), sort='-year')
+            for _ in range(count)
+        ],
+        'decade, by id': [
+            MovieFilters(year_from=decade, year_to=decade + 9) for decade in decades
+        ],
+        'no filter, by title': [MovieFilters(sort='title')] * count,
+    }
+
+
+async def measure(service: MovieService, filters: list, limit: int) -> float:
+    timings = []
+    for movie_filters in filters:
+        started = time.perf_counter()
+        await service.get_movies(limit=limit, filters=movie_filters)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def run(path: str, movies: int, actors: int, args) -> None:
+    filters = sample_filters(movies, actors, args.queries)
+    async with aiosqlite.connect(path) as connection:
+        connection.row_factory = aiosqlite.Row
+        service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+        indexed = {
+            name: await measure(service, queries, args.limit)
+            for name, queries in filters.items()
+        }
+        for index in FILTER_INDEXES:
+            await connection.execute(f'DROP INDEX {index}')
+        unindexed = {
+            name: await measure(service, queries[:10], args.limit)
+            for name, queries in filters.items()
+        }
+
+    for name in filters:
+        print(
+            f"{movies:>9} movies  {name:<28} "
+            f"indexed p50={indexed[name]:8.2f} ms  "
+            f"without indexes p50={unindexed[name]:8.2f} ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--limit', type=int, default=21)
+    args = parser.parse_args()
+
+    for movies in args.sizes:
+        actors = max(movies // 20, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.db')
+            create_catalog(
+                path,
+                movies=movies,
+                actors=actors,
+                actors_per_movie=1,
+                description_length=20
+            )
+            await run(path, movies, actors, args)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
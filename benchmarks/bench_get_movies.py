@@ -0,0 +1,122 @@
+"""Compare the flat LEFT JOIN listing with MovieService.get_movies.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_get_movies --movies 5000 --actors-per-movie 30
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.movie_service import MovieService
+
+LEGACY_QUERY = (
+    'SELECT '
+    'm.id AS movie_id, m.title, m.director, m.year, m.description, '
+    'a.id AS actor_id, a.name, a.surname '
+    'FROM movie m '
+    'LEFT JOIN movie_actor_through mat ON m.id = mat.movie_id '
+    'LEFT JOIN actor a ON a.id = mat.actor_id'
+)
+
+
+async def legacy_get_movies(connection: aiosqlite.Connection) -> list[dict]:
+    async with connection.execute(LEGACY_QUERY) as cursor:
+        rows = await cursor.fetchall()
+
+    movies_data = {}
+    for row in rows:
+        movie_id = row['movie_id']
+        if movie_id not in movies_data:
+            movies_data[movie_id] = {
+                'id': row['movie_id'],
+                'title': row['title'],
+                'director': row['director'],
+                'year': row['year'],
+                'description': row['description'],
+                'actors': []
+            }
+        if row['actor_id'] is not None:
+            movies_data[movie_id]['actors'].append({
+                'id': row['actor_id'],
+                'name': row['name'],
+                'surname': row['surname']
+            })
+    return list(movies_data.values())
+
+
+def _normalized(movies: list[dict]) -> list[dict]:
+    return sorted(
+        (
+            {**movie, 'actors': sorted(movie['actors'], key=lambda a: a['id'])}
+            for movie in movies
+        ),
+        key=lambda movie: movie['id']
+    )
+
+
+async def measure(name: str, fetch, repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        movies = await fetch()
+        timings.append(time.perf_counter() - started)
+
+    # Memory is traced in a separate run, tracemalloc slows allocations down.
+    tracemalloc.start()
+    await fetch()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"{name:<12} movies={len(movies):<8} "
+        f"best={min(timings) * 1000:9.1f} ms  "
+        f"peak={peak / 1024 / 1024:8.1f} MiB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--actors', type=int, default=20000)
+    parser.add_argument('--actors-per-movie', type=int, default=30)
+    parser.add_argument('--description-length', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=args.actors,
+            actors_per_movie=args.actors_per_movie,
+            description_length=args.description_length
+        )
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+
+            legacy = await legacy_get_movies(connection)
+            current = await service.get_movies()
+            assert _normalized(legacy) == _normalized(current), (
+                "both paths must return the same movies"
+            )
+
+            await measure(
+                'left-join',
+                lambda: legacy_get_movies(connection),
+                args.repeat
+            )
+            await measure('set-based', service.get_movies, args.repeat)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Compare N+1 filmography lookups with one batched ?include=movies load.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_include --movies 100000 --actors 10000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.actor_service import ActorService
+from services.movie_service import MovieService
+from services.relation_loader import RelationLoader
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=100_000)
+    parser.add_argument('--actors', type=int, default=10_000)
+    parser.add_argument('--actors-per-movie', type=int, default=5)
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=args.actors,
+            actors_per_movie=args.actors_per_movie,
+            description_length=200
+        )
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            writer = WriteCoordinator(asyncio.Lock())
+            actor_service = ActorService(connection, writer)
+            movie_service = MovieService(connection, writer)
+
+            for page_size in args.pages:
+                n_plus_one, batched = [], []
+                for repeat in range(args.repeat):
+                    actors = await actor_service.get_actors(
+                        after_id=repeat * page_size % args.actors,
+                        limit=page_size
+                    )
+
+                    started = time.perf_counter()
+                    expected = []
+                    for actor in actors:
+                        movies = await actor_service.get_actor_movies(actor['id'])
+                        expected.append({**actor, 'movies': movies})
+                    n_plus_one.append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    loader = RelationLoader(movie_service, actor_service)
+                    included = await loader.attach(
+                        actors,
+                        'movies',
+                        loader.movies_by_actor
+                    )
+                    batched.append(time.perf_counter() - started)
+
+                    assert included == expected
+
+                print(
+                    f"page of {page_size:>4} actors: "
+                    f"N+1 p50={statistics.median(n_plus_one) * 1000:8.2f} ms "
+                    f"({2 * page_size} queries)  "
+                    f"include p50={statistics.median(batched) * 1000:8.2f} ms (1 query)"
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
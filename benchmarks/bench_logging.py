@@ -0,0 +1,74 @@
+"""Measure what a log call costs the caller.
+
+The same INFO messages are logged through the handlers the services used
+to add (stderr plus one synchronous file per service, each of which got
+every record) and through the queued pipeline with and without hot-path
+sampling. Stderr goes to the null device.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --messages 50000
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from log_pipeline import LogPipeline
+
+
+def log_messages(messages: int) -> float:
+    hot = logger.bind(hot_path=True)
+    started = time.perf_counter()
+    for number in range(messages):
+        hot.info("Fetched movie {} in {:.3f} ms", number, 0.25)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=50_000)
+    args = parser.parse_args()
+
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        open(os.devnull, 'w') as devnull,
+        contextlib.redirect_stderr(devnull)
+    ):
+        logger.remove()
+        sinks = [logger.add(sys.stderr, level='INFO')] + [
+            logger.add(Path(directory) / f'{name}.log', rotation='10 MB', level='INFO')
+            for name in ('movie_service', 'actor_service')
+        ]
+        elapsed = log_messages(args.messages)
+        for sink in sinks:
+            logger.remove(sink)
+        print(
+            f"per-module sinks    {elapsed / args.messages * 1e6:6.2f} us/message"
+        )
+
+        for name, sample_every in (('queued', {}), ('queued, INFO=10', {'INFO': 10})):
+            pipeline = LogPipeline(
+                queue_size=args.messages * 2,
+                sample_every=sample_every
+            )
+            pipeline.start(level='INFO', log_dir=Path(directory) / name)
+            elapsed = log_messages(args.messages)
+            drained = time.perf_counter()
+            pipeline.stop()
+            drained = time.perf_counter() - drained
+            print(
+                f"{name:<19} {elapsed / args.messages * 1e6:6.2f} us/message, "
+                f"{drained * 1000:.0f} ms left to write at stop"
+            )
+        logger.remove()
+    logger.add(sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
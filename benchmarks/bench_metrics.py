@@ -0,0 +1,78 @@
+"""Measure what recording metrics adds to queries and requests.
+
+Point lookups run on a plain and on an instrumented connection, and a
+cheap endpoint is called with and without the metrics middleware.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics --queries 20000 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import aiosqlite
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.dataset import create_catalog
+from database.instrumented_sqlite import InstrumentedConnection
+from metrics import MetricsMiddleware
+
+
+async def lookups(path: str, queries: int, factory: type | None) -> float:
+    kwargs = {'factory': factory} if factory is not None else {}
+    async with aiosqlite.connect(path, **kwargs) as connection:
+        rng = random.Random(0)
+        started = time.perf_counter()
+        for _ in range(queries):
+            async with connection.execute(
+                    'SELECT * FROM movie WHERE id=?',
+                    (rng.randint(1, 10_000),)
+            ) as cursor:
+                await cursor.fetchone()
+        return time.perf_counter() - started
+
+
+async def calls(requests: int, instrumented: bool) -> float:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get('/items/{item_id}')
+    async def get_item(item_id: int):
+        return {'id': item_id}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://bench') as client:
+        started = time.perf_counter()
+        for number in range(requests):
+            await client.get(f'/items/{number}')
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=20_000)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(path, movies=10_000, actors=100, actors_per_movie=1)
+        connections = (('plain', None), ('instrumented', InstrumentedConnection))
+        for name, factory in connections:
+            elapsed = await lookups(path, args.queries, factory)
+            print(f"query   {name:<13} {elapsed / args.queries * 1e6:7.1f} us/query")
+
+    await calls(args.requests // 10, instrumented=False)  # warm up
+    for name, instrumented in (('plain', False), ('instrumented', True)):
+        elapsed = await calls(args.requests, instrumented)
+        print(f"request {name:<13} {elapsed / args.requests * 1e6:7.1f} us/request")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""Measure full-text search latency on a large synthetic catalog.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search --movies 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from pagination import DEFAULT_SEARCH_PAGE_SIZE
+from services.movie_service import MovieService
+
+
+async def sample_queries(
+        connection: aiosqlite.Connection,
+        count: int,
+        seed: int = 0
+) -> dict[str, list[str]]:
+    """Pick search terms of different selectivity from the indexed titles."""
+    async with connection.execute(
+            'SELECT title FROM movie ORDER BY random() LIMIT ?',
+            (count,)
+    ) as cursor:
+        titles = [row[0] for row in await cursor.fetchall()]
+    rng = random.Random(seed)
+    words = [rng.choice(title.split()) for title in titles]
+    return {
+        'one word': words,
+        'two words': [
+            ' '.join(title.split()[:2]) for title in titles
+        ],
+        'prefix': [word[:3] for word in words],
+    }
+
+
+async def measure(
+        name: str,
+        service: MovieService,
+        queries: list[str],
+        limit: int
+) -> None:
+    timings = []
+    matches = 0
+    for query in queries:
+        started = time.perf_counter()
+        movies = await service.search_movies(query, limit=limit)
+        timings.append(time.perf_counter() - started)
+        matches += len(movies)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<10} queries={len(queries):<5} "
+        f"avg_results={matches / len(queries):6.1f}  "
+        f"p50={statistics.median(timings) * 1000:8.2f} ms  "
+        f"p95={p95 * 1000:8.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=1_000_000)
+    parser.add_argument('--vocabulary', type=int, default=50_000)
+    parser.add_argument('--description-length', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=DEFAULT_SEARCH_PAGE_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        started = time.perf_counter()
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=1000,
+            actors_per_movie=2,
+            description_length=args.description_length,
+            vocabulary_size=args.vocabulary
+        )
+        elapsed = time.perf_counter() - started
+        print(f"catalog with search index built in {elapsed:.1f} s")
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+            queries = await sample_queries(connection, args.queries)
+            for name, terms in queries.items():
+                await measure(name, service, terms, args.limit + 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
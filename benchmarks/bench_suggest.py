@@ -0,0 +1,98 @@
+"""Compare actor type-ahead through the NOCASE indexes with a LIKE scan.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suggest --actors 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog, spelled
+from database.write_coordinator import WriteCoordinator
+from services.actor_service import ActorService
+
+NAIVE_QUERY = (
+    "SELECT id, name, surname FROM actor NOT INDEXED "
+    "WHERE name LIKE ? || '%' OR surname LIKE ? || '%' "
+    "ORDER BY name, surname, id "
+    "LIMIT ?"
+)
+
+
+async def naive_suggest(
+        connection: aiosqlite.Connection,
+        prefix: str,
+        limit: int
+) -> list[dict]:
+    async with connection.execute(NAIVE_QUERY, (prefix, prefix, limit)) as cursor:
+        return [dict(actor) for actor in await cursor.fetchall()]
+
+
+async def measure(name: str, suggest, prefixes: list[str]) -> None:
+    timings = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        await suggest(prefix)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<8} p50={statistics.median(timings) * 1000:8.3f} ms  "
+        f"p95={p95 * 1000:8.3f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--actors', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    prefixes = []
+    for _ in range(args.queries):
+        letters = spelled(rng.randint(1, args.actors))
+        prefixes.append(rng.choice((
+            f"Name{letters[:2]}",
+            f"surname{letters[:3]}",
+            f"name{letters} Sur",
+        )))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(path, movies=0, actors=args.actors, actors_per_movie=0)
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            service = ActorService(connection, WriteCoordinator(asyncio.Lock()))
+
+            for prefix in prefixes[:10]:
+                indexed = await service.suggest_actors(prefix, args.limit)
+                if ' ' not in prefix:
+                    naive = await naive_suggest(connection, prefix, args.limit)
+                    assert len(indexed) == len(naive), prefix
+
+            print(f"{args.actors} actors, {args.queries} prefixes, top {args.limit}")
+            await measure(
+                'indexed',
+                lambda prefix: service.suggest_actors(prefix, args.limit),
+                prefixes
+            )
+            await measure(
+                'LIKE',
+                lambda prefix: naive_suggest(connection, prefix, args.limit),
+                prefixes
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Compare rewriting a movie's whole cast on update with diffing it.
+
+Each round edits one movie the way a client typically does: the year
+changes and one cast member is swapped. Rows written are counted with
+``total_changes``, which includes the full-text index kept by triggers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_updates --movies 100000 --actors-per-movie 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import StaleEntries, WriteCoordinator
+from services.movie_service import MovieService
+
+
+async def rewrite_all(service: MovieService, movie_id: int, movie: dict) -> None:
+    """The update as it was: every column and every cast link rewritten."""
+
+    async def write(stale: StaleEntries) -> None:
+        await service.connection.execute(
+            'UPDATE movie SET title = ?, director = ?, year = ?, description = ? '
+            'WHERE id = ?',
+            (movie['title'], movie['director'], movie['year'],
+             movie['description'], movie_id)
+        )
+        await service.connection.execute(
+            'DELETE FROM movie_actor_through WHERE movie_id=?',
+            (movie_id,)
+        )
+        await service.connection.executemany(
+            'INSERT INTO movie_actor_through (movie_id, actor_id) VALUES (?, ?)',
+            [(movie_id, actor_id) for actor_id in movie['actors']]
+        )
+
+    await service._write(write)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=100_000)
+    parser.add_argument('--actors', type=int, default=5000)
+    parser.add_argument('--actors-per-movie', type=int, default=20)
+    parser.add_argument('--updates', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        create_catalog(
+            path,
+            movies=args.movies,
+            actors=args.actors,
+            actors_per_movie=args.actors_per_movie,
+            description_length=200
+        )
+
+        async with aiosqlite.connect(path) as connection:
+            connection.row_factory = aiosqlite.Row
+            await connection.execute('PRAGMA foreign_keys = ON')
+            service = MovieService(connection, WriteCoordinator(asyncio.Lock()))
+            rng = random.Random(0)
+
+            async def edit(movie_id: int) -> dict:
+                (movie,) = (await service.get_movies_by_ids([movie_id])).values()
+                actors = [actor['id'] for actor in movie['actors']]
+                actors[rng.randrange(len(actors))] = rng.randint(1, args.actors)
+                return {**movie, 'year': movie['year'] + 1, 'actors': actors}
+
+            for name in ('rewrite', 'diff'):
+                timings, changes = [], []
+                for _ in range(args.updates):
+                    movie_id = rng.randint(1, args.movies)
+                    movie = await edit(movie_id)
+                    before = connection.total_changes
+                    started = time.perf_counter()
+                    if name == 'rewrite':
+                        await rewrite_all(service, movie_id, movie)
+                    else:
+                        await service.update_movie(
+                            movie_id,
+                            movie['title'],
+                            movie['director'],
+                            movie['year'],
+                            movie['description'],
+                            movie['actors']
+                        )
+                    timings.append(time.perf_counter() - started)
+                    changes.append(connection.total_changes - before)
+                print(
+                    f"{name:<8} p50={statistics.median(timings) * 1000:.2f} ms  "
+                    f"rows written/update={statistics.mean(changes):.1f}"
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
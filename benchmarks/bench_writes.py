@@ -0,0 +1,75 @@
+"""Measure write throughput with and without group commit.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_writes --writers 32 --writes-per-writer 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import aiosqlite
+
+from benchmarks.dataset import create_catalog
+from database.write_coordinator import WriteCoordinator
+from services.actor_service import ActorService
+
+
+async def run(
+        path: str,
+        coordinator: WriteCoordinator,
+        writers: int,
+        writes_per_writer: int
+) -> float:
+    async with aiosqlite.connect(path) as connection:
+        connection.row_factory = aiosqlite.Row
+        async with connection.execute("PRAGMA journal_mode = WAL") as cursor:
+            await cursor.fetchone()
+        service = ActorService(connection, coordinator)
+
+        async def writer(number: int) -> None:
+            for i in range(writes_per_writer):
+                await service.add_actor(f"Writer{number}", f"Write{i}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(number) for number in range(writers)))
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=32)
+    parser.add_argument('--writes-per-writer', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--window', type=float, default=0.001)
+    args = parser.parse_args()
+    total = args.writers * args.writes_per_writer
+
+    modes = {
+        # One transaction and one fsync per write, as before group commit.
+        'per-write': WriteCoordinator(asyncio.Lock(), batch_size=1, window=0),
+        'group': WriteCoordinator(
+            asyncio.Lock(),
+            batch_size=args.batch_size,
+            window=args.window
+        ),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, coordinator in modes.items():
+            path = os.path.join(directory, f'{name}.db')
+            create_catalog(path, movies=0, actors=0, actors_per_movie=0)
+            elapsed = await run(path, coordinator, args.writers, args.writes_per_writer)
+            stats = coordinator.stats()
+            print(
+                f"{name:<10} writes={total:<7} "
+                f"elapsed={elapsed * 1000:9.1f} ms  "
+                f"throughput={total / elapsed:9.0f}/s  "
+                f"commits={stats['batches_total']:<6} "
+                f"avg_batch={stats['writes_per_batch_avg']:.1f}"
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+import random
+import sqlite3
+import string
+
+from database.migrations import SCHEMA, apply_migrations
+
+
+def spelled(number: int) -> str:
+    """``number`` in base-26 lowercase letters: the API rejects digits in names."""
+    letters = ''
+    while True:
+        number, digit = divmod(number, 26)
+        letters = string.ascii_lowercase[digit] + letters
+        if not number:
+            return letters
+
+
+def _word(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def create_catalog(
+        path: str,
+        movies: int,
+        actors: int,
+        actors_per_movie: int,
+        description_length: int = 1000,
+        seed: int = 0,
+        vocabulary_size: int = 0
+) -> None:
+    """Create a small synthetic catalog for benchmarks at ``path``.
+
+    With a ``vocabulary_size``, titles and descriptions are made of random
+    words drawn from that many made-up words, for full-text search.
+    """
+    rng = random.Random(seed)
+    vocabulary = [_word(rng) for _ in range(vocabulary_size)]
+
+    def text(length: int, default: str) -> str:
+        if not vocabulary:
+            return default
+        words = []
+        while sum(len(word) + 1 for word in words) < length:
+            words.append(rng.choice(vocabulary))
+        return ' '.join(words)
+
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(SCHEMA)
+        apply_migrations(connection)
+        connection.executemany(
+            "INSERT INTO actor (id, name, surname) VALUES (?, ?, ?)",
+            (
+                (i, f"Name{spelled(i)}", f"Surname{spelled(i)}")
+                for i in range(1, actors + 1)
+            )
+        )
+        connection.executemany(
+            "INSERT INTO movie (id, title, director, year, description) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    text(20, f"Movie {i}"),
+                    f"Director {i % 500}",
+                    rng.randint(1920, 2025),
+                    text(description_length, "x" * description_length)
+                )
+                for i in range(1, movies + 1)
+            )
+        )
+        connection.executemany(
+            "INSERT INTO movie_actor_through (movie_id, actor_id) VALUES (?, ?)",
+            (
+                (movie_id, actor_id)
+                for movie_id in range(1, movies + 1)
+                for actor_id in rng.sample(range(1, actors + 1), actors_per_movie)
+            )
+        )
+        connection.commit()
+    finally:
+        connection.close()
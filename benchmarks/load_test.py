@@ -0,0 +1,466 @@
+"""Load test the whole API with a read/write mix and compare runs.
+
+Virtual users call the app concurrently for a fixed time, each picking
+the next request from a weighted mix. The app is driven in-process
+through httpx's ASGITransport, or over HTTP against a uvicorn server
+started for the run. Either way it runs against a synthetic catalog, as
+movies.db in a temporary directory.
+
+Throughput and p50/p95/p99 latency are reported for the run and per
+operation, along with the resident memory of the process serving it.
+With --output the results are saved as JSON. With --compare they are
+checked against an earlier result, and the exit status is 1 when
+throughput fell or p95/p99 latency grew by more than --tolerance.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --transport asgi --mix read --output before.json
+    python -m benchmarks.load_test --transport uvicorn --mix mixed --movies 100000
+    python -m benchmarks.load_test --compare before.json --output after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator
+
+import httpx
+
+from benchmarks.dataset import create_catalog, spelled
+from pagination import encode_cursor
+
+REPOSITORY_ROOT = Path(__file__).parent.parent
+SERVER_START_TIMEOUT = 30.0
+
+
+@dataclass(frozen=True)
+class Catalog:
+    movies: int
+    actors: int
+    words: list[str]
+
+
+# method, URL and JSON body of one request
+Call = tuple[str, str, dict | None]
+Operation = Callable[[random.Random, Catalog], Call]
+
+
+def get_movie(rng: random.Random, catalog: Catalog) -> Call:
+    return 'GET', f'/movies/{rng.randint(1, catalog.movies)}', None
+
+
+def list_movies(rng: random.Random, catalog: Catalog) -> Call:
+    year = rng.randint(1920, 2015)
+    return 'GET', f'/movies?limit=20&year_from={year}&year_to={year + 10}', None
+
+
+def search_movies(rng: random.Random, catalog: Catalog) -> Call:
+    return 'GET', f'/movies/search?q={rng.choice(catalog.words)}', None
+
+
+def get_actor(rng: random.Random, catalog: Catalog) -> Call:
+    return 'GET', f'/actors/{rng.randint(1, catalog.actors)}', None
+
+
+def list_actors(rng: random.Random, catalog: Catalog) -> Call:
+    cursor = encode_cursor(rng.randint(1, catalog.actors))
+    return 'GET', f'/actors?limit=20&after={cursor}', None
+
+
+def patch_movie(rng: random.Random, catalog: Catalog) -> Call:
+    movie_id = rng.randint(1, catalog.movies)
+    return 'PATCH', f'/movies/{movie_id}', {'year': rng.randint(1920, 2025)}
+
+
+def create_actor(rng: random.Random, catalog: Catalog) -> Call:
+    name = spelled(rng.randrange(1_000_000)).capitalize()
+    return 'POST', '/actors', {'name': name, 'surname': 'Loadtest'}
+
+
+OPERATIONS: dict[str, Operation] = {
+    'get_movie': get_movie,
+    'list_movies': list_movies,
+    'search_movies': search_movies,
+    'get_actor': get_actor,
+    'list_actors': list_actors,
+    'patch_movie': patch_movie,
+    'create_actor': create_actor,
+}
+
+# Relative weights of the operations in each mix.
+MIXES: dict[str, dict[str, int]] = {
+    'read': {
+        'get_movie': 40,
+        'list_movies': 20,
+        'search_movies': 15,
+        'get_actor': 15,
+        'list_actors': 10,
+    },
+    'mixed': {
+        'get_movie': 35,
+        'list_movies': 18,
+        'search_movies': 12,
+        'get_actor': 15,
+        'list_actors': 10,
+        'patch_movie': 7,
+        'create_actor': 3,
+    },
+    'write': {
+        'get_movie': 30,
+        'list_movies': 10,
+        'get_actor': 10,
+        'patch_movie': 30,
+        'create_actor': 20,
+    },
+}
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted, non-empty ``ordered``."""
+    rank = max(1, round(fraction * len(ordered) + 0.5))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    summary = {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': len(ordered) / elapsed,
+    }
+    if ordered:
+        summary.update({
+            'mean_ms': sum(ordered) / len(ordered) * 1000,
+            'p50_ms': percentile(ordered, 0.50) * 1000,
+            'p95_ms': percentile(ordered, 0.95) * 1000,
+            'p99_ms': percentile(ordered, 0.99) * 1000,
+            'max_ms': ordered[-1] * 1000,
+        })
+    return summary
+
+
+def memory_mb(pid: int) -> dict[str, float]:
+    """Current and peak resident memory of ``pid``, empty where /proc is missing."""
+    fields = {'VmRSS': 'rss_mb', 'VmHWM': 'peak_rss_mb'}
+    memory = {}
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as status:
+            for line in status:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    memory[fields[name]] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return memory
+
+
+def prepare_catalog(
+        path: Path,
+        movies: int,
+        actors: int,
+        actors_per_movie: int
+) -> Catalog:
+    create_catalog(
+        str(path),
+        movies=movies,
+        actors=actors,
+        actors_per_movie=min(actors_per_movie, actors),
+        description_length=300,
+        vocabulary_size=5000
+    )
+    connection = sqlite3.connect(path)
+    try:
+        titles = connection.execute('SELECT title FROM movie LIMIT 200').fetchall()
+    finally:
+        connection.close()
+    words = sorted({word for (title,) in titles for word in title.split()})
+    return Catalog(movies, actors, words)
+
+
+async def run_load(
+        client: httpx.AsyncClient,
+        catalog: Catalog,
+        mix: dict[str, int],
+        users: int,
+        duration: float,
+        seed: int
+) -> dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = dict.fromkeys(names, 0)
+    deadline = time.perf_counter() + duration
+
+    async def user(number: int) -> None:
+        rng = random.Random(seed * 1000 + number)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, url, body = OPERATIONS[name](rng, catalog)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(number) for number in range(users)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'elapsed_s': elapsed,
+        'overall': summarize(
+            [latency for timings in latencies.values() for latency in timings],
+            sum(errors.values()),
+            elapsed
+        ),
+        'operations': {
+            name: summarize(latencies[name], errors[name], elapsed)
+            for name in names if latencies[name]
+        },
+    }
+
+
+# A client for the app and the id of the process serving it.
+Served = tuple[httpx.AsyncClient, int]
+
+
+@contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@asynccontextmanager
+async def asgi_client(directory: Path, users: int) -> AsyncIterator[Served]:
+    # main opens movies.db and logs/ relative to the working directory.
+    with working_directory(directory):
+        from main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                    transport=transport,
+                    base_url='http://load-test'
+            ) as client:
+                yield client, os.getpid()
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(directory: Path, users: int) -> AsyncIterator[Served]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', 'main:app',
+            '--host', '127.0.0.1',
+            '--port', str(port),
+            '--log-level', 'warning',
+            '--no-access-log',
+        ],
+        cwd=directory,
+        env={**os.environ, 'PYTHONPATH': str(REPOSITORY_ROOT)}
+    )
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    try:
+        async with httpx.AsyncClient(
+                base_url=f'http://127.0.0.1:{port}',
+                limits=limits,
+                timeout=30.0
+        ) as client:
+            started = time.perf_counter()
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(
+                        f"uvicorn exited with status {server.returncode}"
+                    )
+                try:
+                    await client.get('/')
+                    break
+                except httpx.TransportError:
+                    if time.perf_counter() - started > SERVER_START_TIMEOUT:
+                        raise
+                    await asyncio.sleep(0.1)
+            yield client, server.pid
+    finally:
+        server.terminate()
+        server.wait()
+
+
+TRANSPORTS = {
+    'asgi': asgi_client,
+    'uvicorn': uvicorn_client,
+}
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """What got worse by more than ``tolerance`` since ``baseline``."""
+    regressions = []
+    pairs = [('overall', baseline['overall'], current['overall'])] + [
+        (name, summary, current['operations'][name])
+        for name, summary in baseline['operations'].items()
+        if name in current['operations']
+    ]
+    for name, before, after in pairs:
+        if after['throughput_rps'] < before['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.0f} -> "
+                f"{after['throughput_rps']:.0f} req/s"
+            )
+        for key in ('p95_ms', 'p99_ms'):
+            if key not in before or key not in after:
+                continue
+            if after[key] > before[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key[:3]} {before[key]:.2f} -> {after[key]:.2f} ms"
+                )
+    return regressions
+
+
+def print_report(result: dict) -> None:
+    config = result['config']
+    print(
+        f"{config['transport']} mix={config['mix']} users={config['users']} "
+        f"movies={config['movies']} actors={config['actors']} "
+        f"duration={result['elapsed_s']:.1f} s"
+    )
+    print(
+        f"{'operation':<14} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    rows = list(result['operations'].items()) + [('overall', result['overall'])]
+    for name, summary in rows:
+        print(
+            f"{name:<14} {summary['requests']:>9} {summary['errors']:>7} "
+            f"{summary['throughput_rps']:>9.0f} {summary.get('p50_ms', 0):>8.2f} "
+            f"{summary.get('p95_ms', 0):>8.2f} {summary.get('p99_ms', 0):>8.2f}"
+        )
+    memory = result['memory']
+    if memory:
+        print(
+            f"memory: rss {memory['before']['rss_mb']:.1f} -> "
+            f"{memory['after']['rss_mb']:.1f} MB, "
+            f"peak {memory['after']['peak_rss_mb']:.1f} MB"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transport', choices=sorted(TRANSPORTS), default='asgi')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--users', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--movies', type=int, default=10_000)
+    parser.add_argument('--actors', type=int, default=2000)
+    parser.add_argument('--actors-per-movie', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', type=Path, help="Save the results as JSON here")
+    parser.add_argument('--compare', type=Path, help="Results JSON of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    # Read by log_pipeline on import, in this process and in uvicorn's.
+    os.environ['MOVIES_LOG_LEVEL'] = args.log_level
+    mix = MIXES[args.mix]
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    with tempfile.TemporaryDirectory() as name:
+        directory = Path(name)
+        catalog = prepare_catalog(
+            directory / 'movies.db',
+            args.movies,
+            args.actors,
+            args.actors_per_movie
+        )
+        async with TRANSPORTS[args.transport](directory, args.users) as (client, pid):
+            memory_before = memory_mb(pid)
+            if args.warmup > 0:
+                await run_load(
+                    client,
+                    catalog,
+                    mix,
+                    args.users,
+                    args.warmup,
+                    args.seed + 1
+                )
+            result = await run_load(
+                client,
+                catalog,
+                mix,
+                args.users,
+                args.duration,
+                args.seed
+            )
+            memory_after = memory_mb(pid)
+
+    result = {
+        'config': {
+            'transport': args.transport,
+            'mix': args.mix,
+            'weights': mix,
+            'users': args.users,
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'movies': args.movies,
+            'actors': args.actors,
+            'actors_per_movie': args.actors_per_movie,
+            'seed': args.seed,
+            'log_level': args.log_level,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'started_at': started_at,
+        **result,
+        'memory': (
+            {'before': memory_before, 'after': memory_after} if memory_after else {}
+        ),
+    }
+    print_report(result)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(result, indent=2) + '\n', encoding='utf-8')
+        print(f"saved {args.output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        if baseline['config'] != result['config']:
+            print(f"warning: {args.compare} was run with a different configuration")
+        regressions = compare(baseline, result, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,47 @@
+import hashlib
+
+import aiosqlite
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from database.catalog_version import get_catalog_version
+from database.movies_db_connect import get_read_db
+from streaming import NDJSON_MEDIA_TYPE
+
+
+def make_etag(version: int, request: Request) -> str:
+    """Strong validator for one representation of one catalog resource.
+
+    Any write bumps the catalog version, so an unchanged version guarantees
+    an identical body for the same path, query and media type.
+    """
+    query = '&'.join(sorted(str(request.query_params).split('&')))
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+    representation = f"{request.url.path}?{query}|{ndjson}"
+    digest = hashlib.sha1(representation.encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses the weak comparison function.
+    return '*' in candidates or any(
+        tag.removeprefix('W/') == etag for tag in candidates
+    )
+
+
+async def conditional_get(
+        request: Request,
+        response: Response,
+        db: aiosqlite.Connection = Depends(get_read_db)
+) -> str:
+    """Answer 304 before the endpoint runs when the client copy is current."""
+    etag = make_etag(await get_catalog_version(db), request)
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={'ETag': etag}
+        )
+    response.headers['ETag'] = etag
+    return etag
@@ -0,0 +1,14 @@
+import aiosqlite
+
+
+async def get_catalog_version(connection: aiosqlite.Connection) -> int:
+    """Return the counter every catalog write transaction increments."""
+    query = 'SELECT version FROM catalog_version WHERE id = 1'
+    async with connection.execute(query) as cursor:
+        row = await cursor.fetchone()
+        return row[0] if row is not None else 0
+
+
+async def bump_catalog_version(connection: aiosqlite.Connection) -> None:
+    query = 'UPDATE catalog_version SET version = version + 1 WHERE id = 1'
+    await connection.execute(query)
@@ -0,0 +1,268 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+import aiosqlite
+from loguru import logger
+
+from exceptions import PoolTimeoutError
+
+ConnectionFactory = Callable[[], Awaitable[aiosqlite.Connection]]
+
+
+class ConnectionPool:
+    """Fixed-size pool of long-lived aiosqlite connections.
+
+    Connections are created lazily up to ``size`` (or eagerly by ``open``),
+    handed out LIFO so the most recently used - and therefore warmest -
+    connection is reused first, and health checked with ``SELECT 1`` when
+    they have been idle for longer than ``health_check_interval`` seconds.
+    """
+
+    def __init__(
+            self,
+            connect: ConnectionFactory,
+            size: int = 5,
+            acquire_timeout: float = 10.0,
+            health_check_interval: float = 30.0
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be greater or equal 1")
+        self._connect = connect
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: list[tuple[aiosqlite.Connection, float]] = []
+        self._available = asyncio.Condition()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._acquired_total = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    async def open(self) -> None:
+        """Open every connection up front so the first requests do not pay for it."""
+        self._closed = False
+        async with self._available:
+            while self._created < self.size:
+                connection = await self._new_connection()
+                self._idle.append((connection, time.monotonic()))
+        logger.info("Opened connection pool with {} connections", self.size)
+
+    async def close(self) -> None:
+        async with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for connection, _ in idle:
+            await self._discard(connection)
+        logger.info("Closed connection pool")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        connection = await self._checkout()
+        try:
+            yield connection
+        finally:
+            await self._checkin(connection)
+
+    def stats(self) -> dict:
+        acquired = self._acquired_total
+        return {
+            'size': self.size,
+            'open': self._created,
+            'in_use': self._in_use,
+            'idle': len(self._idle),
+            'waiting': self._waiting,
+            'acquired_total': acquired,
+            'wait_time_total': self._wait_time_total,
+            'wait_time_avg': self._wait_time_total / acquired if acquired else 0.0,
+            'wait_time_max': self._wait_time_max,
+            'timeouts': self._timeouts,
+            'health_check_failures': self._health_check_failures,
+        }
+
+    async def _checkout(self) -> aiosqlite.Connection:
+        started = time.monotonic()
+        async with self._available:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._available.wait_for(self._can_checkout),
+                    timeout=self.acquire_timeout
+                )
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                logger.warning(
+                    "Timed out after {}s waiting for a database connection",
+                    self.acquire_timeout
+                )
+                raise PoolTimeoutError(self.acquire_timeout)
+            finally:
+                self._waiting -= 1
+
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+
+            if self._idle:
+                connection, last_used = self._idle.pop()
+            else:
+                # Take the slot now and open the connection once the lock
+                # is released, so other callers are not held up by it.
+                connection, last_used = None, None
+                self._created += 1
+            self._in_use += 1
+
+        waited = time.monotonic() - started
+        self._acquired_total += 1
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+        try:
+            if connection is None:
+                connection = await self._connect()
+            elif time.monotonic() - last_used > self.health_check_interval:
+                connection = await self._ensure_healthy(connection)
+        except BaseException:
+            async with self._available:
+                self._in_use -= 1
+                self._created -= 1
+                self._available.notify()
+            raise
+        return connection
+
+    async def _checkin(self, connection: aiosqlite.Connection) -> None:
+        try:
+            if connection.in_transaction:
+                await connection.rollback()
+        except Exception:
+            logger.exception("Discarding connection left in a broken transaction")
+            await self._discard(connection)
+            connection = None
+
+        async with self._available:
+            self._in_use -= 1
+            if connection is not None and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._available.notify()
+        if connection is not None:
+            await self._discard(connection)
+
+    def _can_checkout(self) -> bool:
+        return self._closed or bool(self._idle) or self._created < self.size
+
+    async def _ensure_healthy(
+            self,
+            connection: aiosqlite.Connection
+    ) -> aiosqlite.Connection:
+        try:
+            async with connection.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
+            return connection
+        except Exception:
+            self._health_check_failures += 1
+            logger.warning("Pooled connection failed health check, reconnecting")
+            try:
+                await connection.close()
+            except Exception:
+                logger.exception("Error while closing unhealthy connection")
+            return await self._connect()
+
+    async def _new_connection(self) -> aiosqlite.Connection:
+        connection = await self._connect()
+        self._created += 1
+        return connection
+
+    async def _discard(self, connection: aiosqlite.Connection) -> None:
+        self._created -= 1
+        try:
+            await connection.close()
+        except Exception:
+            logger.exception("Error while closing pooled connection")
+
+
+class DedicatedConnection:
+    """A single long-lived connection shared by every caller.
+
+    Used for the writer side of the database: SQLite allows one writer at a
+    time anyway, so instead of pooling, every ``BEGIN IMMEDIATE`` transaction
+    runs on this connection and callers serialize on the write lock. Like a
+    pooled connection it is checked with ``SELECT 1`` when it has not been
+    checked for ``health_check_interval`` seconds, and reopened if that fails.
+    """
+
+    def __init__(
+            self,
+            connect: ConnectionFactory,
+            health_check_interval: float = 30.0
+    ):
+        self._connect = connect
+        self.health_check_interval = health_check_interval
+        self._connection: aiosqlite.Connection | None = None
+        self._connecting = asyncio.Lock()
+        self._checked_at = 0.0
+        self._opened_total = 0
+        self._health_check_failures = 0
+
+    async def open(self) -> None:
+        await self.get()
+        logger.info("Opened dedicated writer connection")
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+            logger.info("Closed dedicated writer connection")
+
+    async def get(self) -> aiosqlite.Connection:
+        connection = self._connection
+        if connection is not None and not self._check_due():
+            return connection
+        async with self._connecting:
+            if self._connection is None:
+                await self._reopen()
+            elif self._check_due():
+                await self._ensure_healthy()
+            return self._connection
+
+    def stats(self) -> dict:
+        return {
+            'connected': self._connection is not None,
+            'opened_total': self._opened_total,
+            'health_check_failures': self._health_check_failures,
+        }
+
+    def _check_due(self) -> bool:
+        return time.monotonic() - self._checked_at > self.health_check_interval
+
+    async def _ensure_healthy(self) -> None:
+        try:
+            async with self._connection.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
+        except Exception:
+            self._health_check_failures += 1
+            logger.warning("Writer connection failed health check, reconnecting")
+            connection, self._connection = self._connection, None
+            try:
+                await connection.close()
+            except Exception:
+                logger.exception("Error while closing unhealthy connection")
+            await self._reopen()
+        else:
+            self._checked_at = time.monotonic()
+
+    async def _reopen(self) -> None:
+        self._connection = await self._connect()
+        self._opened_total += 1
+        self._checked_at = time.monotonic()
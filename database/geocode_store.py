@@ -0,0 +1,108 @@
+import json
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from database.connection_pool import DedicatedConnection
+from database.instrumented_sqlite import InstrumentedConnection
+
+_SCHEMA_PATH = Path(__file__).parent.parent / 'sql_queries' / 'geocode_cache.sql'
+
+Cell = tuple[int, int]
+
+
+class GeocodeStore:
+    """Disk-backed reverse geocoding answers, one row per grid cell.
+
+    Lives in its own SQLite file so the catalog database, its WAL and its
+    backups are not churned by cache traffic. Rows older than ``ttl``
+    seconds are reported as stale rather than dropped, so callers can still
+    fall back to them when the upstream is down.
+    """
+
+    def __init__(self, path: str, precision: int, ttl: float):
+        self.path = path
+        self.precision = precision
+        self.ttl = ttl
+        self._connection = DedicatedConnection(self._connect)
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def _connect(self) -> aiosqlite.Connection:
+        db = await aiosqlite.connect(
+            self.path,
+            timeout=30.0,
+            factory=InstrumentedConnection
+        )
+        try:
+            async with db.execute("PRAGMA journal_mode = WAL") as cursor:
+                await cursor.fetchone()
+            await db.executescript(_SCHEMA_PATH.read_text(encoding='utf-8'))
+        except Exception:
+            await db.close()
+            raise
+        return db
+
+    def cell(self, lat: float, lon: float) -> Cell:
+        scale = 10 ** self.precision
+        return round(lat * scale), round(lon * scale)
+
+    async def get_many(
+            self,
+            cells: list[Cell]
+    ) -> dict[Cell, tuple[dict, bool]]:
+        """Map the stored cells to ``(place, fresh)``."""
+        query = (
+            'SELECT lat_cell, lon_cell, place, fetched_at FROM geocode_cache '
+            'WHERE precision = ? AND (lat_cell, lon_cell) IN ('
+            'SELECT value ->> 0, value ->> 1 FROM json_each(?))'
+        )
+        if not cells:
+            return {}
+        connection = await self._connection.get()
+        async with connection.execute(
+                query,
+                (self.precision, json.dumps(cells))
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        fresh_after = time.time() - self.ttl
+        found = {
+            (lat_cell, lon_cell): (json.loads(place), fetched_at > fresh_after)
+            for lat_cell, lon_cell, place, fetched_at in rows
+        }
+        for _, fresh in found.values():
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        self.misses += len(set(cells)) - len(found)
+        return found
+
+    async def put(self, cell: Cell, place: dict) -> None:
+        query = (
+            'INSERT OR REPLACE INTO geocode_cache '
+            '(precision, lat_cell, lon_cell, place, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?)'
+        )
+        connection = await self._connection.get()
+        await connection.execute(
+            query,
+            (self.precision, *cell, json.dumps(place), time.time())
+        )
+        await connection.commit()
+
+    async def close(self) -> None:
+        await self._connection.close()
+
+    def stats(self) -> dict:
+        return {
+            'path': self.path,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,152 @@
+import re
+import sqlite3
+import time
+from functools import lru_cache
+
+from database.query_stats import query_stats
+from metrics import (
+    DB_CONNECTIONS_CLOSED,
+    DB_CONNECTIONS_OPENED,
+    DB_QUERY_DURATION,
+    DB_QUERY_ROWS
+)
+
+_KEYWORD = re.compile(r'\s*(\w+)')
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+(\w+)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_label(sql: str) -> str:
+    """Bounded metric label for ``sql``: its verb and first table.
+
+    ``SELECT ... FROM movie WHERE ...`` becomes ``select movie``, so the
+    listing queries built from filters share one series however many
+    shapes they take.
+    """
+    keyword = _KEYWORD.match(sql)
+    table = _TABLE.search(sql)
+    verb = keyword.group(1).lower() if keyword else 'unknown'
+    return f"{verb} {table.group(1).lower()}" if table else verb
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor reporting each statement's SQLite time and rows.
+
+    Timings go to the metrics and to ``query_stats``, which keeps totals per
+    fingerprint and logs slow statements with their query plan. A write is
+    done when ``execute`` returns and is recorded there, with the rows it
+    changed. A query keeps stepping while its rows are fetched, so its time
+    and row count add up until the rows run out or the cursor is closed or
+    reused.
+    """
+    _sql: str | None = None
+    _parameters = None
+    _elapsed = 0.0
+    _rows = 0
+
+    def execute(self, sql, parameters=()):
+        return self._timed_execute(super().execute, sql, parameters, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # The parameters may be a one-shot iterator, so there are none to
+        # explain the statement with later.
+        return self._timed_execute(super().executemany, sql, seq_of_parameters, None)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - started
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def _timed_execute(self, execute, sql, parameters, explain_parameters):
+        self._finish()
+        self._sql = sql
+        self._parameters = explain_parameters
+        self._rows = 0
+        started = time.perf_counter()
+        try:
+            execute(sql, parameters)
+        finally:
+            self._elapsed = time.perf_counter() - started
+            if self.description is None:
+                self._rows = max(self.rowcount, 0)
+                self._finish()
+        return self
+
+    def _finish(self) -> None:
+        if self._sql is None:
+            return
+        label = statement_label(self._sql)
+        DB_QUERY_DURATION.observe(self._elapsed, label)
+        if self._rows:
+            DB_QUERY_ROWS.inc(label, amount=self._rows)
+        query_stats.record(self._sql, self._elapsed, self._rows, self._explain)
+        self._sql = self._parameters = None
+
+    def _explain(self) -> list[str] | None:
+        if self._parameters is None:
+            return None
+        try:
+            # A plain cursor, so explaining is not itself recorded.
+            plan = sqlite3.Cursor(self.connection).execute(
+                f"EXPLAIN QUERY PLAN {self._sql}",
+                self._parameters
+            ).fetchall()
+        except sqlite3.Error:
+            return None
+        return [row[3] for row in plan]
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """``sqlite3.connect`` factory whose statements report to the metrics.
+
+    Pass it as ``factory`` to ``aiosqlite.connect``. The shortcut
+    ``execute`` methods are routed through ``cursor()``, as the C
+    implementation would otherwise bypass the instrumented cursor.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        DB_CONNECTIONS_OPENED.inc()
+        self._closed = False
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        super().close()
+        if not self._closed:
+            self._closed = True
+            DB_CONNECTIONS_CLOSED.inc()
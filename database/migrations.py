@@ -0,0 +1,49 @@
+import sqlite3
+from pathlib import Path
+
+SQL_QUERIES_DIR = Path(__file__).parent.parent / 'sql_queries'
+
+# Turns the original single-table movies database into the tables below.
+SCHEMA_UPDATE = 'schema_update.sql'
+
+# The tables SCHEMA_UPDATE creates, for building a database from scratch.
+SCHEMA = """
+CREATE TABLE actor (
+   id INTEGER PRIMARY KEY,
+   name VARCHAR(256),
+   surname VARCHAR(256)
+);
+CREATE TABLE movie (
+   id INTEGER PRIMARY KEY,
+   title VARCHAR(256),
+   director VARCHAR(256),
+   year INTEGER,
+   description TEXT
+);
+CREATE TABLE movie_actor_through (
+   id INTEGER PRIMARY KEY,
+   movie_id INTEGER NOT NULL,
+   actor_id INTEGER NOT NULL,
+   FOREIGN KEY(movie_id) REFERENCES movie(id) ON DELETE CASCADE,
+   FOREIGN KEY(actor_id) REFERENCES actor(id) ON DELETE CASCADE
+);
+"""
+
+# Scripts from sql_queries/ applied on top of the schema, in order. Each
+# one can be run again on a database that already has it.
+MIGRATIONS = [
+    'catalog_version.sql',
+    'movie_actor_indexes.sql',
+    'movie_search.sql',
+    'actor_name_indexes.sql',
+    'movie_filter_indexes.sql',
+]
+
+
+def read_script(name: str) -> str:
+    return (SQL_QUERIES_DIR / name).read_text(encoding='utf-8')
+
+
+def apply_migrations(connection: sqlite3.Connection) -> None:
+    for migration in MIGRATIONS:
+        connection.executescript(read_script(migration))
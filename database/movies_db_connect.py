@@ -1,18 +1,99 @@
 import asyncio
+import os
 
 import aiosqlite
 
+from database.connection_pool import ConnectionPool, DedicatedConnection
+from database.instrumented_sqlite import InstrumentedConnection
+from database.write_coordinator import WriteCoordinator
+
 _MOVIES_DB_NAME = 'movies.db'
 
+_READ_POOL_SIZE = int(os.getenv('MOVIES_DB_POOL_SIZE', '5'))
+_POOL_ACQUIRE_TIMEOUT = float(os.getenv('MOVIES_DB_POOL_ACQUIRE_TIMEOUT', '10.0'))
+_POOL_HEALTH_CHECK_INTERVAL = float(
+    os.getenv('MOVIES_DB_POOL_HEALTH_CHECK_INTERVAL', '30.0')
+)
+_WRITE_BATCH_SIZE = int(os.getenv('MOVIES_DB_WRITE_BATCH_SIZE', '64'))
+_WRITE_BATCH_WINDOW = float(os.getenv('MOVIES_DB_WRITE_BATCH_WINDOW', '0.001'))
+
 db_write_lock = asyncio.Lock()
 
+db_write_coordinator = WriteCoordinator(
+    db_write_lock,
+    batch_size=_WRITE_BATCH_SIZE,
+    window=_WRITE_BATCH_WINDOW
+)
 
-async def get_db():
-    db = await aiosqlite.connect(_MOVIES_DB_NAME, timeout=30.0)
+
+async def _connect_writer() -> aiosqlite.Connection:
+    db = await aiosqlite.connect(
+        _MOVIES_DB_NAME,
+        timeout=30.0,
+        factory=InstrumentedConnection
+    )
     db.row_factory = aiosqlite.Row
     try:
         await db.execute("PRAGMA foreign_keys = ON")
-        await db.execute("PRAGMA journal_mode = WAL")
-        yield db
-    finally:
+        # journal_mode returns a row; leaving that statement unfinished keeps
+        # a lock that makes the read-only connections fail with SQLITE_BUSY.
+        async with db.execute("PRAGMA journal_mode = WAL") as cursor:
+            await cursor.fetchone()
+    except Exception:
         await db.close()
+        raise
+    return db
+
+
+async def _connect_reader() -> aiosqlite.Connection:
+    db = await aiosqlite.connect(
+        _MOVIES_DB_NAME,
+        timeout=30.0,
+        factory=InstrumentedConnection
+    )
+    db.row_factory = aiosqlite.Row
+    try:
+        await db.execute("PRAGMA query_only = ON")
+    except Exception:
+        await db.close()
+        raise
+    return db
+
+
+db_writer = DedicatedConnection(
+    _connect_writer,
+    health_check_interval=_POOL_HEALTH_CHECK_INTERVAL
+)
+
+db_read_pool = ConnectionPool(
+    _connect_reader,
+    size=_READ_POOL_SIZE,
+    acquire_timeout=_POOL_ACQUIRE_TIMEOUT,
+    health_check_interval=_POOL_HEALTH_CHECK_INTERVAL
+)
+
+
+async def open_db() -> None:
+    # The writer goes first: it switches the file to WAL mode, which the
+    # read-only connections cannot do themselves.
+    await db_writer.open()
+    await db_read_pool.open()
+
+
+async def close_db() -> None:
+    await db_read_pool.close()
+    await db_writer.close()
+
+
+async def get_db():
+    yield await db_writer.get()
+
+
+async def get_read_db():
+    async with db_read_pool.acquire() as db:
+        yield db
+
+
+def get_read_pool() -> ConnectionPool:
+    """Give endpoints that outlive their dependencies (streaming) the pool itself."""
+    return db_read_pool
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Callable
+
+from loguru import logger
+
+SLOW_QUERY_THRESHOLD = float(os.getenv('MOVIES_DB_SLOW_QUERY_MS', '100')) / 1000
+MAX_FINGERPRINTS = 1000
+
+# Statements past MAX_FINGERPRINTS distinct ones are counted together here.
+OTHER_FINGERPRINT = 'other'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def normalize(sql: str) -> str:
+    """``sql`` with literals as ``?``, lists of them as ``(...)`` and spaces collapsed.
+
+    Statements that differ only in values or in the length of an ``IN``
+    list normalize to the same text.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Short stable id of ``sql``'s normalized text."""
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:12]
+
+
+class _Fingerprint:
+    __slots__ = ('statement', 'calls', 'total_time', 'max_time', 'rows', 'slow_calls')
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.slow_calls = 0
+
+
+class QueryStats:
+    """Per-fingerprint totals of every statement, and the slow-query log.
+
+    Statements taking ``slow_threshold`` seconds or more are logged with
+    their ``EXPLAIN QUERY PLAN``; ``log_pipeline`` writes them as JSON to
+    ``slow_queries.log``. Records come from the connections' worker
+    threads, hence the lock.
+    """
+
+    def __init__(
+            self,
+            slow_threshold: float = SLOW_QUERY_THRESHOLD,
+            max_fingerprints: int = MAX_FINGERPRINTS
+    ):
+        self.slow_threshold = slow_threshold
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._fingerprints: dict[str, _Fingerprint] = {}
+
+    def record(
+            self,
+            sql: str,
+            elapsed: float,
+            rows: int,
+            explain: Callable[[], list[str] | None]
+    ) -> None:
+        """Count one run of ``sql``; ``explain`` is only called when it was slow."""
+        key = fingerprint(sql)
+        slow = elapsed >= self.slow_threshold
+        with self._lock:
+            entry = self._fingerprints.get(key)
+            if entry is None:
+                if len(self._fingerprints) >= self.max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                    entry = self._fingerprints.setdefault(key, _Fingerprint(''))
+                else:
+                    entry = self._fingerprints[key] = _Fingerprint(normalize(sql))
+            entry.calls += 1
+            entry.total_time += elapsed
+            entry.max_time = max(entry.max_time, elapsed)
+            entry.rows += rows
+            entry.slow_calls += slow
+
+        if slow:
+            logger.bind(
+                slow_query=True,
+                fingerprint=key,
+                statement=normalize(sql),
+                duration_ms=round(elapsed * 1000, 3),
+                rows=rows,
+                plan=explain()
+            ).warning("Slow query {} took {:.1f} ms", key, elapsed * 1000)
+
+    def stats(self, limit: int | None = None) -> list[dict]:
+        """Fingerprints by total time spent in them, largest first."""
+        with self._lock:
+            entries = [
+                (key, entry.statement, entry.calls, entry.total_time,
+                 entry.max_time, entry.rows, entry.slow_calls)
+                for key, entry in self._fingerprints.items()
+            ]
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return [
+            {
+                'fingerprint': key,
+                'statement': statement,
+                'calls': calls,
+                'total_ms': total_time * 1000,
+                'avg_ms': total_time * 1000 / calls,
+                'max_ms': max_time * 1000,
+                'rows': rows,
+                'slow_calls': slow_calls,
+            }
+            for key, statement, calls, total_time, max_time, rows, slow_calls
+            in entries[:limit]
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._fingerprints.clear()
+
+
+query_stats = QueryStats()
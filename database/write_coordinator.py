@@ -0,0 +1,222 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Awaitable, Callable
+from weakref import WeakKeyDictionary
+
+import aiosqlite
+
+from database.catalog_version import bump_catalog_version
+from metrics import DB_WRITE_LOCK_HOLD, DB_WRITE_LOCK_WAIT
+from services.entity_cache import EntityCache
+
+
+class StaleEntries:
+    """Cache entries an operation made stale, dropped once its batch commits."""
+
+    def __init__(self):
+        self.keys: list[tuple] = []
+        self.kinds: list[str] = []
+
+
+WriteOperation = Callable[[StaleEntries], Awaitable[Any]]
+
+
+class _PendingWrite:
+    def __init__(self, operation: WriteOperation, cache: EntityCache | None):
+        self.operation = operation
+        self.cache = cache
+        self.stale = StaleEntries()
+        self.future = asyncio.get_running_loop().create_future()
+
+
+class WriteCoordinator:
+    """Group commit for the single writer connection.
+
+    Writes queued on a connection are run as one ``BEGIN IMMEDIATE``
+    transaction, each inside its own savepoint: a failing operation is rolled
+    back to its savepoint and gets its own exception, while the rest of the
+    batch still commits once. A batch closes after ``window`` seconds or
+    ``batch_size`` operations, whichever comes first; writes arriving while a
+    batch commits form the next one. ``lock`` serializes batches.
+    """
+
+    def __init__(
+            self,
+            lock: asyncio.Lock,
+            batch_size: int = 64,
+            window: float = 0.001
+    ):
+        if batch_size < 1:
+            raise ValueError("Batch size must be greater or equal 1")
+        self.lock = lock
+        self.batch_size = batch_size
+        self.window = window
+        self._queues: WeakKeyDictionary = WeakKeyDictionary()
+        self._drainers: WeakKeyDictionary = WeakKeyDictionary()
+        self._batch_full: WeakKeyDictionary = WeakKeyDictionary()
+
+        self.batches_total = 0
+        self.writes_total = 0
+        self.failed_writes = 0
+        self.failed_batches = 0
+        self.max_batch = 0
+
+    async def submit(
+            self,
+            connection: aiosqlite.Connection,
+            operation: WriteOperation,
+            cache: EntityCache | None = None
+    ) -> Any:
+        """Run ``operation`` in the next batch and return its result once committed."""
+        write = _PendingWrite(operation, cache)
+        queue = self._queues.setdefault(connection, deque())
+        queue.append(write)
+        if len(queue) >= self.batch_size and connection in self._batch_full:
+            self._batch_full[connection].set()
+
+        drainer = self._drainers.get(connection)
+        if drainer is None or drainer.done():
+            # The drainer is a task of its own so that a cancelled request
+            # cannot abandon a batch that other callers are waiting on.
+            self._drainers[connection] = asyncio.ensure_future(
+                self._drain(connection)
+            )
+        return await write.future
+
+    async def _drain(self, connection: aiosqlite.Connection) -> None:
+        queue = self._queues[connection]
+        while queue:
+            if self.window > 0 and len(queue) < self.batch_size:
+                batch_full = self._batch_full[connection] = asyncio.Event()
+                try:
+                    await asyncio.wait_for(batch_full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    del self._batch_full[connection]
+
+            waiting = time.perf_counter()
+            async with self.lock:
+                acquired = time.perf_counter()
+                DB_WRITE_LOCK_WAIT.observe(acquired - waiting)
+                try:
+                    batch = [
+                        queue.popleft()
+                        for _ in range(min(self.batch_size, len(queue)))
+                    ]
+                    batch = [write for write in batch if not write.future.done()]
+                    if batch:
+                        await self._run_batch(connection, batch)
+                finally:
+                    DB_WRITE_LOCK_HOLD.observe(time.perf_counter() - acquired)
+
+    async def _run_batch(
+            self,
+            connection: aiosqlite.Connection,
+            batch: list[_PendingWrite]
+    ) -> None:
+        results = {}
+        # Rows changed by the operations that succeeded; none means the
+        # catalog is as it was and its version, hence ETags, stay put.
+        changes = 0
+        try:
+            await connection.execute("BEGIN IMMEDIATE")
+            for index, write in enumerate(batch):
+                savepoint = f"write_{index}"
+                await connection.execute(f"SAVEPOINT {savepoint}")
+                before = connection.total_changes
+                try:
+                    results[write] = await write.operation(write.stale)
+                except Exception as error:
+                    await connection.execute(f"ROLLBACK TO {savepoint}")
+                    await connection.execute(f"RELEASE {savepoint}")
+                    self.failed_writes += 1
+                    # A cancelled caller's future is already done.
+                    if not write.future.done():
+                        write.future.set_exception(error)
+                else:
+                    changes += connection.total_changes - before
+                    await connection.execute(f"RELEASE {savepoint}")
+
+            if results:
+                await self._commit(connection, list(results), changed=changes > 0)
+            else:
+                await connection.rollback()
+        except Exception as error:
+            self.failed_batches += 1
+            # Every caller gets the original error; a connection too broken
+            # to roll back must not also stop the writes queued behind it.
+            with suppress(Exception):
+                await connection.rollback()
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(error)
+            return
+
+        self.batches_total += 1
+        self.writes_total += len(results)
+        self.max_batch = max(self.max_batch, len(batch))
+        for write, result in results.items():
+            if not write.future.done():
+                write.future.set_result(result)
+
+    @staticmethod
+    async def _commit(
+            connection: aiosqlite.Connection,
+            committed: list[_PendingWrite],
+            changed: bool
+    ) -> None:
+        # One version bump per batch: readers only need to see it change.
+        if changed:
+            await bump_catalog_version(connection)
+
+        caches = {id(write.cache): write.cache for write in committed
+                  if write.cache is not None}
+        for cache in caches.values():
+            cache.begin_write()
+        try:
+            await connection.commit()
+        finally:
+            for cache in caches.values():
+                stale = [write.stale for write in committed if write.cache is cache]
+                cache.end_write(
+                    keys=tuple(key for entries in stale for key in entries.keys),
+                    kinds=tuple(kind for entries in stale for kind in entries.kinds)
+                )
+
+    def stats(self) -> dict:
+        return {
+            'batch_size': self.batch_size,
+            'window': self.window,
+            'queued': sum(len(queue) for queue in self._queues.values()),
+            'batches_total': self.batches_total,
+            'writes_total': self.writes_total,
+            'writes_per_batch_avg': (
+                self.writes_total / self.batches_total if self.batches_total else 0.0
+            ),
+            'max_batch': self.max_batch,
+            'failed_writes': self.failed_writes,
+            'failed_batches': self.failed_batches,
+        }
+
+
+class NestedWriter:
+    """Writer for services used inside an operation the coordinator is running.
+
+    Their writes run at once in the enclosing transaction and record what
+    they make stale in the enclosing operation's ``stale``, so a single
+    submitted operation can reuse the services' own write logic.
+    """
+
+    def __init__(self, stale: StaleEntries):
+        self.stale = stale
+
+    async def submit(
+            self,
+            connection: aiosqlite.Connection,
+            operation: WriteOperation,
+            cache: EntityCache | None = None
+    ) -> Any:
+        return await operation(self.stale)
@@ -3,6 +3,41 @@ class DatabaseError(Exception):
     pass
 
 
+class PoolTimeoutError(DatabaseError):
+    def __init__(self, timeout: float):
+        """Exception raised when no pooled connection frees up in time."""
+        self.timeout = timeout
+        self.message = f"No database connection available within {timeout}s"
+        super().__init__(self.message)
+
+
+class InvalidCursorError(ValueError):
+    def __init__(self, cursor: str):
+        """Exception raised when a pagination cursor cannot be decoded."""
+        self.cursor = cursor
+        self.message = f"Invalid pagination cursor: {cursor}"
+        super().__init__(self.message)
+
+
+class InvalidFieldsError(ValueError):
+    def __init__(
+            self,
+            unknown: list[str],
+            allowed: tuple[str, ...],
+            parameter: str = 'fields'
+    ):
+        """Exception raised when ?fields= or ?include= names nothing or unknowns."""
+        self.unknown = unknown
+        self.allowed = allowed
+        self.parameter = parameter
+        reason = (
+            f"Unknown {parameter}: {', '.join(unknown)}" if unknown
+            else f"No {parameter}"
+        )
+        self.message = f"{reason}. Available {parameter}: {', '.join(allowed)}"
+        super().__init__(self.message)
+
+
 class ActorNotFoundError(DatabaseError):
     def __init__(self, actor_id: int):
         """Exception raised when an actor is not found."""
@@ -17,3 +52,39 @@ class MovieNotFoundError(DatabaseError):
         self.movie_id = movie_id
         self.message = f"Movie with ID {movie_id} not found"
         super().__init__(self.message)
+
+
+class UnknownActorsError(ValueError):
+    def __init__(self, actor_ids: list[int]):
+        """Exception raised when a movie's cast names actors that do not exist."""
+        self.actor_ids = actor_ids
+        self.message = f"Unknown actor IDs {actor_ids}"
+        super().__init__(self.message)
+
+
+class BatchOperationError(Exception):
+    def __init__(self, index: int, status_code: int, message: str):
+        """Exception raised when an operation of an atomic batch fails."""
+        self.index = index
+        self.status_code = status_code
+        self.message = f"Operation {index} failed: {message}"
+        super().__init__(self.message)
+
+
+class UnsupportedImportFormatError(ValueError):
+    def __init__(self, content_type: str):
+        """Exception raised when a bulk import body is neither NDJSON nor CSV."""
+        self.content_type = content_type
+        self.message = (
+            f"Unsupported import format: {content_type or 'none'}. "
+            "Use application/x-ndjson or text/csv"
+        )
+        super().__init__(self.message)
+
+
+class GeocodingError(Exception):
+    def __init__(self, status_code: int):
+        """Exception raised when the reverse geocoding upstream fails."""
+        self.status_code = status_code
+        self.message = "Cannot pull geolocalization data."
+        super().__init__(self.message)
@@ -0,0 +1,119 @@
+from functools import lru_cache
+from typing import Callable
+
+from fastapi import Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from exceptions import InvalidFieldsError
+
+
+@lru_cache(maxsize=256)
+def partial_model(
+        model: type[BaseModel],
+        names: tuple[str, ...]
+) -> type[BaseModel]:
+    """A response model with only ``names`` of ``model``'s fields."""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=model.model_config,
+        **{
+            name: (model.model_fields[name].annotation, model.model_fields[name])
+            for name in names
+        }
+    )
+
+
+@lru_cache(maxsize=512)
+def _adapter(model: type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(list[model] if many else model)
+
+
+class FieldSelection:
+    """The fields a client asked for with ``?fields=``, in model order."""
+
+    def __init__(self, model: type[BaseModel], names: tuple[str, ...]):
+        self.names = names
+        self.model = partial_model(model, names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def render(self, content: dict | list[dict], response: Response) -> JSONResponse:
+        """Serialize ``content`` with the partial model.
+
+        Headers already set on the endpoint's ``response`` (ETag, cursors)
+        are carried over, as FastAPI does not merge them into a returned
+        response.
+        """
+        adapter = _adapter(self.model, many=not isinstance(content, dict))
+        return JSONResponse(
+            adapter.dump_python(adapter.validate_python(content), mode='json'),
+            headers=dict(response.headers)
+        )
+
+
+def sparse_fields(model: type[BaseModel]) -> Callable[..., FieldSelection | None]:
+    """Dependency reading ``?fields=`` for responses of ``model``.
+
+    Without the parameter it resolves to ``None`` and the endpoint answers
+    with every field, as before.
+    """
+    allowed = tuple(model.model_fields)
+
+    def dependency(
+            fields: str | None = Query(
+                None,
+                description=f"Comma-separated subset of: {', '.join(allowed)}"
+            )
+    ) -> FieldSelection | None:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = requested - set(allowed)
+        if not requested or unknown:
+            raise InvalidFieldsError(sorted(unknown), allowed)
+        return FieldSelection(
+            model,
+            tuple(name for name in allowed if name in requested)
+        )
+
+    return dependency
+
+
+def included_relations(*allowed: str) -> Callable[..., frozenset[str]]:
+    """Dependency reading ``?include=``, the related resources to embed."""
+
+    def dependency(
+            include: str | None = Query(
+                None,
+                description=f"Comma-separated relations to embed: {', '.join(allowed)}"
+            )
+    ) -> frozenset[str]:
+        if include is None:
+            return frozenset()
+        requested = {name.strip() for name in include.split(',') if name.strip()}
+        unknown = requested - set(allowed)
+        if not requested or unknown:
+            raise InvalidFieldsError(sorted(unknown), allowed, parameter='include')
+        return frozenset(requested)
+
+    return dependency
+
+
+def with_included(
+        fields: FieldSelection | None,
+        model: type[BaseModel],
+        include: frozenset[str]
+) -> FieldSelection | None:
+    """Selection rendering the requested fields of ``model`` plus ``include``.
+
+    ``model`` is the response model that has the included relations.
+    """
+    if not include:
+        return fields
+    names = set(fields.names if fields is not None else model.model_fields) | include
+    return FieldSelection(
+        model,
+        tuple(name for name in model.model_fields if name in names)
+    )
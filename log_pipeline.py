@@ -0,0 +1,265 @@
+import itertools
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, TextIO
+
+from loguru import logger
+
+from metrics import LOG_RECORDS_DROPPED, LOG_RECORDS_SAMPLED_OUT
+
+LOG_DIR = Path(os.getenv('MOVIES_LOG_DIR', 'logs'))
+LOG_LEVEL = os.getenv('MOVIES_LOG_LEVEL', 'INFO')
+LOG_QUEUE_SIZE = int(os.getenv('MOVIES_LOG_QUEUE_SIZE', '10000'))
+LOG_ROTATION_BYTES = int(os.getenv('MOVIES_LOG_ROTATION_BYTES', str(10 * 1024 * 1024)))
+LOG_BATCH_SIZE = 512
+# How long stop() waits to queue its marker and for the writer to finish.
+LOG_STOP_TIMEOUT = 5.0
+
+TEXT_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
+    "{name}:{function}:{line} - {message}"
+)
+
+
+def parse_sample_every(spec: str) -> dict[str, int]:
+    """``"DEBUG=100,INFO=10"`` as ``{'DEBUG': 100, 'INFO': 10}``."""
+    sample_every = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        level, _, every = item.partition('=')
+        sample_every[level.strip().upper()] = int(every)
+    return sample_every
+
+
+# Keep one hot-path record in N per level; levels not listed are all kept.
+HOT_PATH_SAMPLE_EVERY = parse_sample_every(
+    os.getenv('MOVIES_LOG_HOT_PATH_SAMPLE_EVERY', 'DEBUG=100,INFO=10')
+)
+
+
+class _RotatingFile:
+    """Append-only log file, moved aside once it grows past ``max_bytes``."""
+
+    def __init__(self, path: Path, max_bytes: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._file = open(path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def write(self, text: str) -> None:
+        size = len(text.encode('utf-8'))
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += size
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        stamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')
+        self.path.rename(
+            self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        )
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = 0
+
+
+class _Stream:
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+
+    def write(self, text: str) -> None:
+        self._stream.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+_STOP = object()
+
+
+class LogPipeline:
+    """Loguru handlers that only queue formatted records; a thread writes them.
+
+    Logging on the request and write paths then costs formatting and a
+    queue put, never file I/O. The queue holds at most ``queue_size``
+    records; when the writer falls that far behind, new records are dropped
+    and counted rather than blocking the caller. The writer drains up to
+    ``batch_size`` records at a time and flushes each target once per batch.
+
+    Records logged with ``hot_path=True`` in their extra, as the services
+    do through ``logger.bind(hot_path=True)``, are sampled: of each level listed in
+    ``sample_every`` only one in N is kept. Levels not listed, such as
+    warnings and errors, are always kept.
+    """
+
+    def __init__(
+            self,
+            queue_size: int = LOG_QUEUE_SIZE,
+            sample_every: dict[str, int] | None = None,
+            batch_size: int = LOG_BATCH_SIZE
+    ):
+        self.queue_size = queue_size
+        self.sample_every = (
+            HOT_PATH_SAMPLE_EVERY if sample_every is None else sample_every
+        )
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._counters = {level: itertools.count() for level in self.sample_every}
+        self._targets: dict[str, _RotatingFile | _Stream] = {}
+        self._handler_ids: list[int] = []
+        self._writer: threading.Thread | None = None
+
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.write_errors = 0
+
+    def start(self, level: str = LOG_LEVEL, log_dir: Path = LOG_DIR) -> None:
+        """Replace loguru's handlers with queued ones and start the writer."""
+        if self._writer is not None:
+            return
+        self._targets = {
+            'stderr': _Stream(sys.stderr),
+            'app': _RotatingFile(log_dir / 'app.log', LOG_ROTATION_BYTES),
+            'slow_queries': _RotatingFile(
+                log_dir / 'slow_queries.log',
+                LOG_ROTATION_BYTES
+            ),
+        }
+        self._writer = threading.Thread(
+            target=self._drain,
+            name='log-writer',
+            daemon=True
+        )
+        self._writer.start()
+
+        logger.remove()
+        logger.configure(patcher=self._sample)
+        self._handler_ids = [
+            logger.add(
+                self._sink('stderr'),
+                level=level,
+                format=TEXT_FORMAT,
+                filter=self._kept
+            ),
+            logger.add(
+                self._sink('app'),
+                level=level,
+                format=TEXT_FORMAT,
+                filter=self._kept
+            ),
+            logger.add(
+                self._sink('slow_queries'),
+                level='WARNING',
+                serialize=True,
+                filter=lambda record: 'slow_query' in record['extra']
+            ),
+        ]
+
+    def stop(self) -> None:
+        """Write out what is queued, stop the writer and log to stderr again."""
+        if self._writer is None:
+            return
+        for handler_id in self._handler_ids:
+            logger.remove(handler_id)
+        self._handler_ids = []
+        logger.configure(patcher=None)
+        # A writer that died, or is stuck, must not block shutdown forever.
+        if self._writer.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=LOG_STOP_TIMEOUT)
+            except queue.Full:
+                pass
+            else:
+                self._writer.join(timeout=LOG_STOP_TIMEOUT)
+        self._writer = None
+        for target in self._targets.values():
+            target.close()
+        logger.add(sys.stderr, level=LOG_LEVEL)
+
+    def stats(self) -> dict:
+        return {
+            'running': self._writer is not None,
+            'queued': self._queue.qsize(),
+            'queue_size': self.queue_size,
+            'written': self.written,
+            'dropped': self.dropped,
+            'sampled_out': self.sampled_out,
+            'write_errors': self.write_errors,
+            'hot_path_sample_every': self.sample_every,
+        }
+
+    def _sample(self, record: dict) -> None:
+        # A patcher runs once per record, so every handler agrees on it.
+        if not record['extra'].get('hot_path'):
+            return
+        counter = self._counters.get(record['level'].name)
+        if counter is None:
+            return
+        every = self.sample_every[record['level'].name]
+        if every < 1 or next(counter) % every:
+            record['extra']['sampled_out'] = True
+            self.sampled_out += 1
+            LOG_RECORDS_SAMPLED_OUT.inc()
+
+    @staticmethod
+    def _kept(record: dict) -> bool:
+        return not record['extra'].get('sampled_out')
+
+    def _sink(self, target: str) -> Callable[[str], None]:
+        def enqueue(message: str) -> None:
+            try:
+                self._queue.put_nowait((target, str(message)))
+            except queue.Full:
+                self.dropped += 1
+                LOG_RECORDS_DROPPED.inc()
+
+        return enqueue
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = False
+            touched = set()
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                target, text = item
+                # Any failure is counted: an exception would end the thread
+                # and leave the queue to fill up.
+                try:
+                    self._targets[target].write(text)
+                    self.written += 1
+                except Exception:
+                    self.write_errors += 1
+                touched.add(target)
+            for target in touched:
+                try:
+                    self._targets[target].flush()
+                except Exception:
+                    self.write_errors += 1
+            if stopping:
+                return
+
+
+log_pipeline = LogPipeline()